@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import html
 import http
 import logging
+import multiprocessing
 import os
 import secrets
 import threading
 import webbrowser
-from typing import TYPE_CHECKING, Callable, Optional, cast
+from typing import TYPE_CHECKING, Optional, cast
 
 if TYPE_CHECKING:
     import starlette.types
@@ -40,6 +42,15 @@ class HotReloadHandler(logging.Handler):
 
     def __init__(self):
         logging.Handler.__init__(self)
+        # Importing the websockets client takes a while; do it in the background now so
+        # that reload_end() doesn't have to wait for it once the app has started up.
+        # Uvicorn also instantiates this handler in the reload supervisor (the parent
+        # process), which never calls reload_end(); only warm the import in a worker.
+        if (
+            os.getenv("SHINY_AUTORELOAD_PORT")
+            and multiprocessing.parent_process() is not None
+        ):
+            threading.Thread(target=_import_websockets_client, daemon=True).start()
 
     def emit(self, record: logging.LogRecord) -> None:
         # https://github.com/encode/uvicorn/blob/266db48888f3f1ba56710a49ec82e12eecde3aa3/uvicorn/supervisors/statreload.py#L46
@@ -51,6 +62,10 @@ class HotReloadHandler(logging.Handler):
             reload_end()
 
 
+def _import_websockets_client() -> None:
+    import websockets.asyncio.client  # noqa: F401 # pyright: ignore[reportUnusedImport]
+
+
 # Called from child process when old application instance is shut down
 def reload_begin():
     pass
@@ -109,14 +124,10 @@ class InjectAutoreloadMiddleware:
             app = cast(ASGI3Application, app)
         self.app = app
         ws_url = autoreload_url()
-        self.script = (
-            f"""  <script src="__shared/shiny-autoreload.js" data-ws-url="{html.escape(ws_url)}"></script>
-</head>""".encode(
-                "ascii"
-            )
-            if ws_url
-            else bytes()
-        )
+        self.script = _autoreload_script(ws_url) if ws_url else bytes()
+        # Without an autoreload URL there's nothing to inject, so every request can go
+        # straight through to the app
+        self._passthrough = len(self.script) == 0
 
     async def __call__(
         self,
@@ -133,21 +144,28 @@ class InjectAutoreloadMiddleware:
             receive = cast(ASGIReceiveCallable, receive)
             send = cast(ASGISendCallable, send)
 
-        if scope["type"] != "http":
+        if self._passthrough:
             return await self.app(scope, receive, send)
-        if scope["path"] != "/" or len(self.script) == 0:
+        if scope["type"] != "http" or scope["path"] != "/":
             return await self.app(scope, receive, send)
 
-        def mangle_callback(body: bytes) -> tuple[bytes, bool]:
-            if b"</head>" in body:
-                return (body.replace(b"</head>", self.script, 1), True)
-            else:
-                return (body, False)
-
-        mangler = ResponseMangler(send, mangle_callback)
+        mangler = ResponseMangler(send, self.script)
         await self.app(scope, receive, mangler.send)
 
 
+_HEAD_CLOSE = b"</head>"
+
+
+@functools.lru_cache(maxsize=4)
+def _autoreload_script(ws_url: str) -> bytes:
+    """The bytes to substitute for `</head>`, shared by all middleware instances that
+    use the same autoreload URL."""
+    return f"""  <script src="__shared/shiny-autoreload.js" data-ws-url="{html.escape(ws_url)}"></script>
+</head>""".encode(
+        "ascii"
+    )
+
+
 # PARENT PROCESS ------------------------------------------------------------
 
 
@@ -201,7 +219,8 @@ async def _coro_main(
     import websockets.asyncio.server
     from websockets.http11 import Request, Response
 
-    reload_now: asyncio.Event = asyncio.Event()
+    # Browsers currently connected to the /autoreload path
+    autoreload_clients: set[websockets.asyncio.server.ServerConnection] = set()
 
     def nudge():
         nonlocal launch_browser
@@ -209,8 +228,9 @@ async def _coro_main(
             # Only launch the browser once, not every time autoreload occurs
             launch_browser = False
             webbrowser.open(app_url, 1)
-        reload_now.set()
-        reload_now.clear()
+        # Queue the message on every connection at once, rather than waking up each
+        # connection's handler to send it individually
+        websockets.asyncio.server.broadcast(autoreload_clients, "autoreload")
 
     async def reload_server(conn: websockets.asyncio.server.ServerConnection):
         try:
@@ -221,9 +241,11 @@ async def _coro_main(
             elif conn.request.path == "/autoreload":
                 # The client wants to be notified when the app has reloaded. The client
                 # in this case is the web browser, specifically shiny-autoreload.js.
-                while True:
-                    await reload_now.wait()
-                    await conn.send("autoreload")
+                autoreload_clients.add(conn)
+                try:
+                    await conn.wait_closed()
+                finally:
+                    autoreload_clients.discard(conn)
             elif conn.request.path == "/notify":
                 # The client is notifying us that the app has reloaded. The client in
                 # this case is the uvicorn worker process (see reload_end(), above).
@@ -262,33 +284,35 @@ async def _coro_main(
 
 
 class ResponseMangler:
-    """A class that assists with intercepting and rewriting response bodies being sent
-    over ASGI. This would be easy if not for 1) response bodies are potentially sent in
-    chunks, over multiple events; 2) the first response event we receive is the one that
-    contains the Content-Length, which can be affected when we do rewriting later on.
-    The ResponseMangler handles the buffering and content-length rewriting, leaving the
-    caller to only have to worry about the actual body-modifying logic.
+    """A class that assists with intercepting response bodies being sent over ASGI, and
+    replacing the first `</head>` with the autoreload script. This would be easy if not
+    for 1) response bodies are potentially sent in chunks, over multiple events; 2) the
+    first response event we receive is the one that contains the Content-Length, which
+    is affected when we insert the script later on. The ResponseMangler handles the
+    buffering and content-length rewriting.
+
+    A new instance is created for every request, so it uses `__slots__` to keep that
+    cheap.
     """
 
-    def __init__(
-        self, send: ASGISendCallable, mangler: Callable[[bytes], tuple[bytes, bool]]
-    ) -> None:
+    __slots__ = ("_send", "_script", "_done", "_response_start", "_body")
+
+    def __init__(self, send: ASGISendCallable, script: bytes) -> None:
         # The underlying ASGI send function
         self._send = send
-        # The caller-provided logic for rewriting the body. Takes a single `bytes`
-        # argument that is _all_ of the body bytes seen _so far_, and returns a tuple of
-        # (bytes, bool) where the bytes are the (possibly modified) body bytes and the
-        # bool is True if the mangler does not care to see any more data.
-        self._mangler = mangler
+        # The bytes to substitute for the first `</head>` in the body
+        self._script = script
 
-        # If True, the mangler is done and any further data can simply be passed along
+        # If True, the script has been inserted (or can't be) and any further data can
+        # simply be passed along
         self._done: bool = False
 
         # Holds the http.response.start event, which may need its Content-Length header
         # rewritten before we send it
         self._response_start: Optional[HTTPResponseStartEvent] = None
-        # All the response body bytes we have seen so far
-        self._body: bytes = b""
+        # All the response body bytes we have seen so far. This is a bytearray so that
+        # appending each chunk is amortized O(1) rather than copying the whole body.
+        self._body: bytearray = bytearray()
 
     async def send(self, event: ASGISendEvent) -> None:
         if self._done:
@@ -296,6 +320,15 @@ class ResponseMangler:
             return
 
         if event["type"] == "http.response.start":
+            # ASGI allows headers to be omitted or to be any iterable, possibly a
+            # one-shot one; make it a list up front so it can be scanned here and
+            # rewritten later
+            event["headers"] = list(event.get("headers", []))
+            if not _may_be_html(event):
+                # Nothing to mangle here; don't bother buffering the body
+                self._done = True
+                await self._send(event)
+                return
             self._response_start = event
         elif event["type"] == "http.response.body":
             # This check is mostly to make pyright happy
@@ -304,52 +337,59 @@ class ResponseMangler:
                     "http.response.body ASGI event sent before http.response.start"
                 )
 
-            # Add the newly received body data to what we've seen already
+            # Add the newly received body data to what we've seen already. Only the new
+            # data needs to be searched, after backing up a few bytes in case `</head>`
+            # straddles two chunks.
+            start = max(0, len(self._body) - len(_HEAD_CLOSE) + 1)
             self._body += event["body"]
-            # Snapshot length before we mess with the body
-            old_len = len(self._body)
-            # Mangle away! If done is True, the mangler doesn't want to do any further
-            # mangling.
-            self._body, done = self._mangler(self._body)
-
-            new_len = len(self._body)
-            if new_len != old_len:
-                # The mangling check changed the length of the body. Add the difference
-                # to the content-length header (if content-length is even present)
-                _add_to_content_length(self._response_start, new_len - old_len)
+
+            idx = self._body.find(_HEAD_CLOSE, start)
+            found = idx != -1
+            if found:
+                self._body[idx : idx + len(_HEAD_CLOSE)] = self._script
+                # Add the difference to the content-length header (if content-length is
+                # even present)
+                _add_to_content_length(
+                    self._response_start, len(self._script) - len(_HEAD_CLOSE)
+                )
 
             more_body = event.get("more_body", False)
 
-            if done or not more_body:
-                # Either we've seen the whole body by now (`not more_body`) or the
-                # mangler has seen all the data it cares to (`done`). Either way, we can
-                # send all the data we have.
+            if found or not more_body:
+                # Either we've seen the whole body by now (`not more_body`) or we've
+                # inserted the script (`found`). Either way, we can send all the data we
+                # have.
                 self._done = True
                 await self._send(self._response_start)
                 await self._send(
                     {
                         "type": "http.response.body",
-                        "body": self._body,
+                        "body": bytes(self._body),
                         "more_body": more_body,
                     }
                 )
                 # Allow gc
                 self._response_start = None
-                self._body = b""
+                self._body = bytearray()
             else:
-                # If we get here, then the mangler isn't done and we are expecting to
-                # see more data. Do nothing.
+                # If we get here, then we haven't found `</head>` yet and we are
+                # expecting to see more data. Do nothing.
                 pass
 
 
+def _may_be_html(event: HTTPResponseStartEvent) -> bool:
+    """False if event has a Content-Type header that isn't text/html"""
+    for name, value in event["headers"]:
+        if name.lower() == b"content-type":
+            return value.lower().startswith(b"text/html")
+    return True
+
+
 def _add_to_content_length(event: HTTPResponseStartEvent, offset: int) -> None:
     """If event has a Content-Length header, add the specified number of bytes to it
-    (may be negative)"""
-    event["headers"] = [
-        (
-            (name, str(int(value) + offset).encode("latin-1"))
-            if name.decode("ascii").lower() == "content-length"
-            else (name, value)
-        )
-        for (name, value) in event["headers"]
-    ]
+    (may be negative). The headers must already have been made a list."""
+    headers = cast("list[tuple[bytes, bytes]]", event["headers"])
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"content-length":
+            headers[i] = (name, str(int(value) + offset).encode("latin-1"))
+            return
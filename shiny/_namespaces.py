@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 from contextlib import contextmanager
 from contextvars import ContextVar, Token
@@ -13,12 +14,23 @@ class ResolvedId(str):
         if isinstance(id, ResolvedId):
             return id
 
-        validate_id(id)
+        if not isinstance(id, str):
+            # Raise a helpful error before the value reaches the (hashing) cache
+            validate_id(id)
 
-        if self == "":
-            return ResolvedId(id)
-        else:
-            return ResolvedId(str(self) + self._sep + id)
+        return _resolve_str_id(self, id)
+
+
+# The same ids get resolved over and over (every time a module's UI is built, every
+# time an output or input is looked up), and resolving is pure, so cache the results.
+@functools.lru_cache(maxsize=1024)
+def _resolve_str_id(ns: ResolvedId, id: str) -> ResolvedId:
+    validate_id(id)
+
+    if ns == "":
+        return ResolvedId(id)
+    else:
+        return ResolvedId(str(ns) + ns._sep + id)
 
 
 Root: ResolvedId = ResolvedId("")
@@ -5,17 +5,6 @@ import re
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, cast
 
-from ..types import (
-    Coordmap,
-    CoordmapDims,
-    CoordmapPanel,
-    CoordmapPanelDomain,
-    CoordmapPanelLog,
-    CoordmapPanelMapping,
-    CoordmapPanelRange,
-    PlotnineFigure,
-)
-
 if TYPE_CHECKING:
     import numpy as np
     import numpy.typing as npt
@@ -23,6 +12,17 @@ if TYPE_CHECKING:
     from matplotlib.figure import Figure
     from matplotlib.gridspec import SubplotSpec
 
+    from ..types import (
+        Coordmap,
+        CoordmapDims,
+        CoordmapPanel,
+        CoordmapPanelDomain,
+        CoordmapPanelLog,
+        CoordmapPanelMapping,
+        CoordmapPanelRange,
+        PlotnineFigure,
+    )
+
 
 def get_coordmap(fig: Figure) -> Coordmap | None:
     dims_ar = fig.get_size_inches() * fig.get_dpi()
@@ -5,7 +5,7 @@ import io
 import warnings
 from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Union, cast
 
-from ..types import ImgData, PlotnineFigure
+from ..types import ImgData
 from ._coordmap import get_coordmap, get_coordmap_plotnine
 
 TryPlotResult = Tuple[bool, Union[ImgData, None]]
@@ -14,6 +14,8 @@ TryPlotResult = Tuple[bool, Union[ImgData, None]]
 if TYPE_CHECKING:
     from matplotlib.figure import Figure
 
+    from ..types import PlotnineFigure
+
 
 class PlotSizeInfo:
     """This class carries information from the render.plot transformer to the logic that
@@ -343,7 +345,7 @@ def try_render_plotnine(
 
     fig_initial_size_inches = p9options.figure_size
 
-    x = cast(PlotnineFigure, x)
+    x = cast("PlotnineFigure", x)
 
     fig_result_size_inches = fig_initial_size_inches
     figure_size = x.theme.themeables.get("figure_size")
@@ -6,6 +6,7 @@ __all__ = (
     "require_active_session",
 )
 
+import sys
 from contextlib import contextmanager
 from contextvars import ContextVar, Token
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
@@ -14,8 +15,8 @@ if TYPE_CHECKING:
     from ._session import Session
 
 from .._docstring import no_example
+from .._namespaces import ResolvedId, Root, _current_namespace
 from .._typing_extensions import TypedDict
-from ..module import namespace_context
 
 
 class RenderedDeps(TypedDict):
@@ -68,10 +69,15 @@ def session_context(session: Session | None):
         :func:`~shiny.session.get_current_session`.
     """
     token: Token[Session | None] = _current_session.set(session)
+    # This is entered for every reactive execution, so set the namespace directly
+    # instead of nesting namespace_context(). `session.ns` is already resolved.
+    ns_token: Token[ResolvedId | None] = _current_namespace.set(
+        session.ns if session is not None else Root
+    )
     try:
-        with namespace_context(session.ns if session is not None else None):
-            yield
+        yield
     finally:
+        _current_namespace.reset(ns_token)
         _current_session.reset(token)
 
 
@@ -110,21 +116,20 @@ def require_active_session(session: Optional[Session]) -> Session:
     if session is None:
         session = get_current_session()
     if session is None:
-        import inspect
-
-        call_stack = inspect.stack()
-        if len(call_stack) > 1:
-            caller = call_stack[1]
-        else:
+        # Use sys._getframe() rather than inspect.stack(), which reads the source file
+        # for every frame on the stack.
+        try:
+            caller = sys._getframe(1)
+        except ValueError:
             # Uncommon case: this function is called from the top-level, so the caller
             # is just require_active_session.
-            caller = call_stack[0]
+            caller = sys._getframe(0)
 
-        calling_fn_name = caller.function
+        calling_fn_name = caller.f_code.co_name
         if calling_fn_name == "__init__":
             # If the caller is __init__, then we're most likely in the initialization of
             # an object. This will get the class name.
-            calling_fn_name = caller.frame.f_locals["self"].__class__.__name__
+            calling_fn_name = caller.f_locals["self"].__class__.__name__
 
         raise RuntimeError(
             f"{calling_fn_name}() must be called from within an active Shiny session."
@@ -226,46 +226,47 @@ class NavSetArg(Protocol):
 # =============================================================================
 
 
-# Use this protocol to avoid needing to maintain working stubs for plotnint. If
-# good stubs ever become available for plotnine, use those instead.
-class PlotnineFigure(Protocol):
-    scales: list[Any]
-    coordinates: Any
-    facet: Any
-    layout: Any
-    mapping: dict[str, str]
-    theme: PlotnineTheme
-
-    def save(
-        self,
-        filename: BinaryIO,
-        format: str,
-        units: str,
-        dpi: float,
-        width: float,
-        height: float,
-        verbose: bool,
-        bbox_inches: object = None,
-    ): ...
-
-    def draw(self, show: bool) -> Figure: ...
-
+# Plotnine and coordmap types only used internally for type annotations, so they're
+# only defined when type checking; creating them at runtime would add to the import
+# time of shiny.
+if TYPE_CHECKING:
 
-class PlotnineTheme(NamedTuple):
-    themeables: PlotnineThemeables
+    # Use this protocol to avoid needing to maintain working stubs for plotnint. If
+    # good stubs ever become available for plotnine, use those instead.
+    class PlotnineFigure(Protocol):
+        scales: list[Any]
+        coordinates: Any
+        facet: Any
+        layout: Any
+        mapping: dict[str, str]
+        theme: PlotnineTheme
 
+        def save(
+            self,
+            filename: BinaryIO,
+            format: str,
+            units: str,
+            dpi: float,
+            width: float,
+            height: float,
+            verbose: bool,
+            bbox_inches: object = None,
+        ): ...
 
-class PlotnineThemeables(TypedDict):
-    figure_size: PlotnineThemeable | None
+        def draw(self, show: bool) -> Figure: ...
 
+    class PlotnineTheme(NamedTuple):
+        themeables: PlotnineThemeables
 
-class PlotnineThemeable(NamedTuple):
-    properties: dict[str, Any]
+    class PlotnineThemeables(TypedDict):
+        figure_size: PlotnineThemeable | None
 
+    class PlotnineThemeable(NamedTuple):
+        properties: dict[str, Any]
 
-class CoordmapDims(TypedDict):
-    width: float
-    height: float
+    class CoordmapDims(TypedDict):
+        width: float
+        height: float
 
 
 class CoordmapPanelLog(TypedDict):
@@ -294,25 +295,26 @@ class CoordmapPanelMapping(TypedDict):
     panelvar2: NotRequired[str]
 
 
-class CoordmapPanelvarValues(TypedDict):
-    panelvar1: NotRequired[float]
-    panelvar2: NotRequired[float]
-
-
-class CoordmapPanel(TypedDict):
-    panel: int
-    row: NotRequired[int]
-    col: NotRequired[int]
-    panel_vars: NotRequired[CoordmapPanelvarValues]
-    log: CoordmapPanelLog
-    domain: CoordmapPanelDomain
-    mapping: CoordmapPanelMapping
-    range: CoordmapPanelRange
-
+# Only used internally for type annotations; see above.
+if TYPE_CHECKING:
 
-class Coordmap(TypedDict):
-    panels: list[CoordmapPanel]
-    dims: CoordmapDims
+    class CoordmapPanelvarValues(TypedDict):
+        panelvar1: NotRequired[float]
+        panelvar2: NotRequired[float]
+
+    class CoordmapPanel(TypedDict):
+        panel: int
+        row: NotRequired[int]
+        col: NotRequired[int]
+        panel_vars: NotRequired[CoordmapPanelvarValues]
+        log: CoordmapPanelLog
+        domain: CoordmapPanelDomain
+        mapping: CoordmapPanelMapping
+        range: CoordmapPanelRange
+
+    class Coordmap(TypedDict):
+        panels: list[CoordmapPanel]
+        dims: CoordmapDims
 
 
 class CoordXY(TypedDict):
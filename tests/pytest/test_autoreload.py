@@ -0,0 +1,174 @@
+"""Tests for `shiny._autoreload`."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from shiny._autoreload import InjectAutoreloadMiddleware
+
+HeadersWrapper = Callable[[list[tuple[bytes, bytes]]], Iterable[tuple[bytes, bytes]]]
+
+
+def make_app(
+    chunks: list[bytes],
+    content_type: bytes = b"text/html; charset=utf-8",
+    wrap_headers: HeadersWrapper = list,
+):
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                # ASGI allows any iterable here, not just a list
+                "headers": wrap_headers(
+                    [
+                        (b"content-type", content_type),
+                        (
+                            b"Content-Length",
+                            str(sum(map(len, chunks))).encode("latin-1"),
+                        ),
+                    ]
+                ),
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    return app
+
+
+async def run_middleware(
+    chunks: list[bytes],
+    content_type: bytes = b"text/html; charset=utf-8",
+    wrap_headers: HeadersWrapper = list,
+) -> tuple[int, bytes]:
+    middleware = InjectAutoreloadMiddleware(
+        make_app(chunks, content_type, wrap_headers)
+    )
+    events: list[Any] = []
+
+    async def send(event: Any) -> None:
+        events.append(event)
+
+    async def receive() -> Any:
+        raise AssertionError("receive() should not be called")
+
+    await middleware({"type": "http", "path": "/"}, receive, send)  # type: ignore
+
+    assert events[0]["type"] == "http.response.start"
+    headers = dict(events[0]["headers"])
+    body = b"".join(e["body"] for e in events[1:])
+    assert events[-1]["more_body"] is False
+    return int(headers[b"Content-Length"]), body
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+async def test_inject_autoreload_script(
+    monkeypatch: pytest.MonkeyPatch, chunk_size: int
+):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+    html = b"<html><head><title>x</title></head><body>" + b"y" * 50 + b"</body></html>"
+    chunks = [html[i : i + chunk_size] for i in range(0, len(html), chunk_size)]
+
+    content_length, body = await run_middleware(chunks)
+
+    assert body.count(b"shiny-autoreload.js") == 1
+    assert body.count(b"</head>") == 1
+    assert body.index(b"shiny-autoreload.js") < body.index(b"</head>")
+    assert body.endswith(b"<body>" + b"y" * 50 + b"</body></html>")
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+async def test_inject_autoreload_no_head(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+    chunks = [b"<html><body>", b"no head here", b"</body></html>"]
+
+    content_length, body = await run_middleware(chunks)
+
+    assert body == b"".join(chunks)
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+async def test_inject_autoreload_disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("SHINY_AUTORELOAD_PORT", raising=False)
+    chunks = [b"<html><head></head>", b"<body></body></html>"]
+
+    content_length, body = await run_middleware(chunks)
+
+    assert body == b"".join(chunks)
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+async def test_inject_autoreload_skips_non_html(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+    chunks = [b'{"html": "<head></head>"}']
+
+    content_length, body = await run_middleware(chunks, b"application/json")
+
+    assert body == b"".join(chunks)
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("wrap_headers", [list, tuple, iter])
+async def test_inject_autoreload_headers_iterable(
+    monkeypatch: pytest.MonkeyPatch, wrap_headers: HeadersWrapper
+):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+    chunks = [b"<html><head></he", b"ad><body></body></html>"]
+
+    content_length, body = await run_middleware(chunks, wrap_headers=wrap_headers)
+
+    assert body.count(b"shiny-autoreload.js") == 1
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+async def test_inject_autoreload_skips_non_html_headers_iterator(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+    chunks = [b'{"html": "<head></head>"}']
+
+    content_length, body = await run_middleware(chunks, b"application/json", iter)
+
+    assert body == b"".join(chunks)
+    assert content_length == len(body)
+
+
+@pytest.mark.asyncio
+async def test_inject_autoreload_no_headers(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("SHINY_AUTORELOAD_PORT", "8765")
+
+    async def app(scope: Any, receive: Any, send: Any) -> None:
+        # ASGI makes "headers" optional
+        await send({"type": "http.response.start", "status": 200})
+        await send({"type": "http.response.body", "body": b"<head></head>"})
+
+    events: list[Any] = []
+
+    async def send(event: Any) -> None:
+        events.append(event)
+
+    async def receive() -> Any:
+        raise AssertionError("receive() should not be called")
+
+    middleware = InjectAutoreloadMiddleware(app)
+    await middleware({"type": "http", "path": "/"}, receive, send)  # type: ignore
+
+    assert events[0]["type"] == "http.response.start"
+    assert events[0]["headers"] == []
+    body = b"".join(e["body"] for e in events[1:])
+    assert body.count(b"shiny-autoreload.js") == 1
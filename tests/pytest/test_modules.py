@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import asyncio
-from typing import cast
+from typing import NamedTuple, cast
 
 import pytest
 from htmltools import HTML, Tag, TagList
@@ -28,6 +27,10 @@ def mod_outer_ui() -> TagList:
     return TagList(mod_inner_ui("inner"), ui.output_text("out2"))
 
 
+# What a client sends when it connects; MockConnection messages are JSON strings
+_INIT_MSG = '{"method":"init","data":{}}'
+
+
 def get_id(x: TagList, child_idx: int = 0) -> str | HTML:
     return cast(Tag, x[child_idx]).attrs["id"]
 
@@ -42,79 +45,101 @@ def test_module_ui():
     assert get_id(y, 2) == "outer-out2"
 
 
+class ScopeSnapshot(NamedTuple):
+    """What a module (or top-level) server's effect sees"""
+
+    session: Session
+    current: Session | None
+    calc_current: Session | None
+    id: str
+    ui_id: str | HTML
+
+
+def current_session_calc() -> reactive.Calc_[Session | None]:
+    # Must be called from within a server function, so the calc belongs to that session
+    @reactive.calc
+    def out():
+        return get_current_session()
+
+    return out
+
+
 @pytest.mark.asyncio
 async def test_session_scoping():
-    sessions: dict[str, Session | str | HTML | None] = {}
+    sessions: dict[str, ScopeSnapshot] = {}
 
     @module.server
     def inner_server(input: Inputs, output: Outputs, session: Session):
-        @reactive.calc
-        def out():
-            return get_current_session()
+        out = current_session_calc()
 
         @reactive.effect
         def _():
-            sessions["inner"] = session
-            sessions["inner_current"] = get_current_session()
-            sessions["inner_calc_current"] = out()
-            sessions["inner_id"] = session.ns("foo")
-            sessions["inner_ui_id"] = get_id(mod_outer_ui("outer"), 0)
+            sessions["inner"] = ScopeSnapshot(
+                session=session,
+                current=get_current_session(),
+                calc_current=out(),
+                id=session.ns("foo"),
+                ui_id=get_id(mod_outer_ui("outer"), 0),
+            )
 
     @module.server
     def outer_server(input: Inputs, output: Outputs, session: Session):
-        @reactive.calc
-        def out():
-            return get_current_session()
+        out = current_session_calc()
 
         @reactive.effect
         def _():
             inner_server("mod_inner")
-            sessions["outer"] = session
-            sessions["outer_current"] = get_current_session()
-            sessions["outer_calc_current"] = out()
-            sessions["outer_id"] = session.ns("foo")
-            sessions["outer_ui_id"] = get_id(mod_outer_ui("outer"), 0)
+            sessions["outer"] = ScopeSnapshot(
+                session=session,
+                current=get_current_session(),
+                calc_current=out(),
+                id=session.ns("foo"),
+                ui_id=get_id(mod_outer_ui("outer"), 0),
+            )
 
     def server(input: Inputs, output: Outputs, session: Session):
         outer_server("mod_outer")
 
-        @reactive.calc
-        def out():
-            return get_current_session()
+        out = current_session_calc()
 
         @reactive.effect
         def _():
-            sessions["top"] = session
-            sessions["top_current"] = get_current_session()
-            sessions["top_calc_current"] = out()
-            sessions["top_id"] = session.ns("foo")
-            sessions["top_ui_id"] = get_id(mod_outer_ui("outer"), 0)
+            sessions["top"] = ScopeSnapshot(
+                session=session,
+                current=get_current_session(),
+                calc_current=out(),
+                id=session.ns("foo"),
+                ui_id=get_id(mod_outer_ui("outer"), 0),
+            )
 
     conn = MockConnection()
     sess = App(ui.TagList(), server)._create_session(conn)
 
-    async def mock_client():
-        conn.cause_receive('{"method":"init","data":{}}')
-        conn.cause_disconnect()
-
-    await asyncio.gather(mock_client(), sess._run())
-
-    assert sessions["inner"] is sessions["inner_current"]
-    assert sessions["inner_current"] is sessions["inner_calc_current"]
-    assert isinstance(sessions["inner_current"], SessionProxy)
-    assert sessions["inner_current"].root_scope() is sessions["top"]
-    assert sessions["inner_id"] == "mod_outer-mod_inner-foo"
-    assert sessions["inner_ui_id"] == "mod_outer-mod_inner-outer-inner-button"
-
-    assert sessions["outer"] is sessions["outer_current"]
-    assert sessions["outer_current"] is sessions["outer_calc_current"]
-    assert isinstance(sessions["outer_current"], SessionProxy)
-    assert sessions["outer_current"].root_scope() is sessions["top"]
-    assert sessions["outer_id"] == "mod_outer-foo"
-    assert sessions["outer_ui_id"] == "mod_outer-outer-inner-button"
-
-    assert sessions["top"] is sessions["top_current"]
-    assert sessions["top_current"] is sessions["top_calc_current"]
-    assert isinstance(sessions["top_current"], AppSession)
-    assert sessions["top_id"] == "foo"
-    assert sessions["top_ui_id"] == "outer-inner-button"
+    # Queue up everything the client will send before running the session; it consumes
+    # the messages in order and returns once it sees the disconnect.
+    conn.cause_receive(_INIT_MSG)
+    conn.cause_disconnect()
+    await sess._run()
+
+    inner = sessions["inner"]
+    assert inner.session is inner.current
+    assert inner.current is inner.calc_current
+    assert isinstance(inner.current, SessionProxy)
+    assert inner.current.root_scope() is sessions["top"].session
+    assert inner.id == "mod_outer-mod_inner-foo"
+    assert inner.ui_id == "mod_outer-mod_inner-outer-inner-button"
+
+    outer = sessions["outer"]
+    assert outer.session is outer.current
+    assert outer.current is outer.calc_current
+    assert isinstance(outer.current, SessionProxy)
+    assert outer.current.root_scope() is sessions["top"].session
+    assert outer.id == "mod_outer-foo"
+    assert outer.ui_id == "mod_outer-outer-inner-button"
+
+    top = sessions["top"]
+    assert top.session is top.current
+    assert top.current is top.calc_current
+    assert isinstance(top.current, AppSession)
+    assert top.id == "foo"
+    assert top.ui_id == "outer-inner-button"
@@ -1,3 +1,5 @@
+import pytest
+
 from shiny._namespaces import namespace_context
 from shiny.module import resolve_id
 
@@ -38,3 +40,22 @@ def test_namespaces():
 
         # Check that this still works after another context was installed/removed
         assert resolve_id("inner") == "outer-inner"
+
+
+def test_namespaces_cached_resolution():
+    # Resolution is cached; the same id under different namespaces must still resolve
+    # differently, however many times it's resolved
+    for _ in range(3):
+        with namespace_context("a"):
+            assert resolve_id("x") == "a-x"
+        with namespace_context("b"):
+            assert resolve_id("x") == "b-x"
+        assert resolve_id("x") == "x"
+
+    # Invalid ids must raise every time, not only the first time
+    for _ in range(3):
+        with namespace_context("a"):
+            with pytest.raises(ValueError):
+                resolve_id("not valid")
+        with pytest.raises(ValueError):
+            resolve_id("")